@@ -3,17 +3,117 @@ import csv
 import datetime
 import os
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Resolved chromedriver binary, memoized for the lifetime of the process and
+# persisted on disk so fresh processes can skip ChromeDriverManager entirely.
+_DRIVER_PATH = None
+_DRIVER_PATH_CACHE = os.path.join(
+    os.path.expanduser("~"), ".cache", "brno-crawler", "driver_path"
+)
+
+
+def _get_driver_path():
+    global _DRIVER_PATH
+    if _DRIVER_PATH is not None:
+        return _DRIVER_PATH
+
+    try:
+        with open(_DRIVER_PATH_CACHE) as f:
+            cached = f.read().strip()
+    except OSError:
+        cached = ""
+
+    if cached and os.path.isfile(cached):
+        _DRIVER_PATH = cached
+        return _DRIVER_PATH
+
+    _DRIVER_PATH = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(_DRIVER_PATH_CACHE), exist_ok=True)
+        with open(_DRIVER_PATH_CACHE, "w") as f:
+            f.write(_DRIVER_PATH)
+    except OSError:
+        # The on-disk cache is only an optimization
+        pass
+    return _DRIVER_PATH
+
+
+def _reset_driver_path():
+    global _DRIVER_PATH
+    _DRIVER_PATH = None
+    try:
+        os.remove(_DRIVER_PATH_CACHE)
+    except OSError:
+        pass
+
+
+CSV_HEADER = ("timestamp", "occupancy")
+# Buffer size and flush cadence for the long-lived handle used in loop mode
+CSV_BUFFER_SIZE = 1 << 16
+CSV_FLUSH_EVERY = 10
+
+
+def setup_service():
+    return Service(_get_driver_path())
+
+
+def setup_driver(service=None, extra_args=()):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    # Nothing we scrape depends on images or browser background services
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-sync")
+    options.add_argument("--mute-audio")
+    options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        },
+    )
+    for arg in extra_args:
+        options.add_argument(arg)
+    if service is not None:
+        return webdriver.Chrome(service=service, options=options)
+
+    try:
+        return webdriver.Chrome(service=setup_service(), options=options)
+    except SessionNotCreatedException:
+        # The cached chromedriver no longer matches the installed Chrome
+        # (e.g. after an auto-update), so resolve it again and retry once
+        _reset_driver_path()
+        return webdriver.Chrome(service=setup_service(), options=options)
+
 
 class BaseCrawler(abc.ABC):
-    def __init__(self, data_dir="data"):
+    # Crawlers that can scrape without a browser set this to False
+    needs_driver = True
+    # Additional Chrome command-line switches for this crawler
+    extra_args = ()
+
+    def __init__(self, data_dir="data", service=None):
+        self.service = service
         self.data_dir = os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
             data_dir,
         )
         self.csv_file = os.path.join(self.data_dir, f"{self.source_name}.csv")
+        # Unknown until the first write, then cached to skip the stat calls
+        self._header_written = None
+        # Long-lived handle, only open in loop mode (see open_log)
+        self._csv_fh = None
+        self._csv_writer = None
+        self._flush_every = CSV_FLUSH_EVERY
+        self._pending_rows = 0
 
     @property
     @abc.abstractmethod
@@ -26,46 +126,91 @@ class BaseCrawler(abc.ABC):
         pass
 
     def setup_driver(self):
-        options = webdriver.ChromeOptions()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--window-size=1920,1080")
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        return driver
+        return setup_driver(self.service, self.extra_args)
 
     @abc.abstractmethod
     def fetch_data(self, driver):
         pass
 
+    def fetch_row(self):
+        driver = None
+        try:
+            if self.needs_driver:
+                driver = self.setup_driver()
+            data = self.fetch_data(driver)
+        except Exception as e:
+            print(f"[{self.source_name}] An error occurred: {e}")
+            return None
+        finally:
+            if driver:
+                driver.quit()
+
+        if not data:
+            return None
+        return (datetime.datetime.now().isoformat(), data)
+
     def log_to_csv(self, data):
         if not data:
             print(f"[{self.source_name}] No data found.")
             return
 
-        timestamp = datetime.datetime.now().isoformat()
-        file_exists = os.path.isfile(self.csv_file)
-        os.makedirs(self.data_dir, exist_ok=True)
+        self.log_many([(datetime.datetime.now().isoformat(), data)])
+
+    def open_log(self, flush_every=CSV_FLUSH_EVERY):
+        self._check_header()
+        self._csv_fh = open(
+            self.csv_file, "a", buffering=CSV_BUFFER_SIZE, newline=""
+        )
+        self._csv_writer = csv.writer(self._csv_fh)
+        self._flush_every = flush_every
+        self._pending_rows = 0
+
+    def close_log(self):
+        if self._csv_fh is not None:
+            self._csv_fh.close()
+            self._csv_fh = None
+            self._csv_writer = None
+
+    def _check_header(self):
+        if self._header_written is None:
+            os.makedirs(self.data_dir, exist_ok=True)
+            self._header_written = (
+                os.path.isfile(self.csv_file)
+                and os.path.getsize(self.csv_file) > 0
+            )
+
+    def _write_rows(self, writer, rows):
+        if not self._header_written:
+            writer.writerow(CSV_HEADER)
+            self._header_written = True
 
-        with open(self.csv_file, "a", newline="") as csvfile:
-            fieldnames = ["timestamp", "occupancy"]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writerows(rows)
 
-            if not file_exists:
-                writer.writeheader()
+    def log_many(self, rows):
+        if not rows:
+            print(f"[{self.source_name}] No data found.")
+            return
+
+        if self._csv_fh is not None:
+            self._write_rows(self._csv_writer, rows)
+            self._pending_rows += len(rows)
+            if self._pending_rows >= self._flush_every:
+                self._csv_fh.flush()
+                self._pending_rows = 0
+        else:
+            self._check_header()
+            with open(self.csv_file, "a", newline="") as csvfile:
+                self._write_rows(csv.writer(csvfile), rows)
 
-            writer.writerow({"timestamp": timestamp, "occupancy": data})
+        for timestamp, data in rows:
             print(f"[{self.source_name}] Logged: {timestamp}, {data}")
 
-    def run(self):
-        driver = None
+    def fetch_and_log(self):
+        row = self.fetch_row()
         try:
-            driver = self.setup_driver()
-            data = self.fetch_data(driver)
-            self.log_to_csv(data)
+            self.log_many([row] if row else [])
         except Exception as e:
             print(f"[{self.source_name}] An error occurred: {e}")
-        finally:
-            if driver:
-                driver.quit()
+
+    def run(self):
+        self.fetch_and_log()
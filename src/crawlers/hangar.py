@@ -3,6 +3,26 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from .base import BaseCrawler
 
+_LABEL = "Current occupancy"
+_LABEL_UPPER = _LABEL.upper()
+
+# Returns [label container text, text of the element following the label]
+STATUS_SCRIPT = """
+const label = document.evaluate(
+  "//*[contains(text(), 'Current occupancy')]",
+  document,
+  null,
+  XPathResult.FIRST_ORDERED_NODE_TYPE,
+  null
+).singleNodeValue;
+if (!label) return null;
+const container = label.parentElement || label;
+let node = label;
+while (node && !node.nextElementSibling) node = node.parentElement;
+const next = node ? node.nextElementSibling : null;
+return [container.innerText, next ? next.innerText : null];
+"""
+
 
 class HangarCrawler(BaseCrawler):
     @property
@@ -25,51 +45,24 @@ class HangarCrawler(BaseCrawler):
         )
 
         try:
-            # Find the element with "Current occupancy"
-            label_element = driver.find_element(
-                By.XPATH, "//*[contains(text(), 'Current occupancy')]"
-            )
-
-            # The state is likely in a text node following the element or its parents.
-            # We need to traverse up until we find a container that has more text than just the label.
-            current_element = label_element
-            full_text = current_element.text
-
-            # Traverse up to 3 levels to find the container with the status text
-            for _ in range(3):
-                try:
-                    parent = current_element.find_element(By.XPATH, "..")
-                    parent_text = parent.text
-                    # If parent has more text (and it's not just whitespace difference), use it
-                    if (
-                        len(parent_text.strip()) > len(full_text.strip()) + 5
-                    ):  # +5 for "Open!" or similar
-                        full_text = parent_text
-                        current_element = parent
-                        break
-                    current_element = parent
-                    full_text = parent_text
-                except Exception:
-                    break
-
-            # Normalize text for comparison
-            text_upper = full_text.strip().upper()
+            # Locate the status in-page and return it in a single round-trip.
+            # Only the label's container text and the next element's text
+            # cross the wire, instead of the whole rendered DOM.
+            texts = driver.execute_script(STATUS_SCRIPT)
+            if not texts:
+                return None
+            container_text, following_text = texts
 
-            # If the text is just "CURRENT OCCUPANCY", try to find a sibling of the current container
-            if text_upper == "CURRENT OCCUPANCY":
-                try:
-                    next_sibling = current_element.find_element(
-                        By.XPATH, "following-sibling::*"
-                    )
-                    return next_sibling.text
-                except Exception:
-                    pass
+            full_text = " ".join((container_text or "").split())
+            idx = full_text.upper().find(_LABEL_UPPER)
+            if idx != -1:
+                status = full_text[idx + len(_LABEL) :].strip()
+                if status:
+                    return status
 
-            # If text contains "CURRENT OCCUPANCY", extract the part after it
-            if "CURRENT OCCUPANCY" in text_upper:
-                idx = text_upper.find("CURRENT OCCUPANCY")
-                # Return the part after it from the original string
-                return full_text[idx + len("Current occupancy") :].strip()
+            # Otherwise it is the first element following the label
+            if following_text:
+                return " ".join(following_text.split())
 
             return full_text
 
@@ -1,10 +1,33 @@
+import lxml.etree
+import lxml.html
+import requests
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from .base import BaseCrawler
 
+_AREA_SELECTOR = "#info-ticket-collapse .col.area.person"
+_BAZENY = "BAZÉNY"
+# Without a charset hint lxml falls back to latin-1, which turns "BAZÉNY"
+# into mojibake and misses the match. Parsing bytes keeps any XML encoding
+# declaration working, and invalid UTF-8 is replaced instead of raising.
+_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Returns [area text, span.time text] for every occupancy area on the page
+AREAS_SCRIPT = f"""
+return [...document.querySelectorAll("{_AREA_SELECTOR}")].map(el => {{
+  const time = el.querySelector("span.time");
+  return [el.innerText, time ? time.innerText : null];
+}});
+"""
+
 
 class LuzankyCrawler(BaseCrawler):
+    # The occupancy is server-rendered, so a plain HTTP request is enough
+    needs_driver = False
+    # Only the HTML matters when falling back to the browser
+    extra_args = ("--disable-features=Translate,MediaRouter",)
+
     @property
     def source_name(self):
         return "luzanky"
@@ -13,28 +36,63 @@ class LuzankyCrawler(BaseCrawler):
     def url(self):
         return "https://bazenyluzanky.starez.cz/"
 
-    def fetch_data(self, driver):
+    def fetch_data(self, driver=None):
+        try:
+            data = self.fetch_static()
+        except requests.RequestException as e:
+            # The browser would hit the same outage, only 20 s later
+            print(f"[{self.source_name}] HTTP request failed: {e}")
+            return None
+        except (lxml.etree.LxmlError, ValueError) as e:
+            print(f"[{self.source_name}] Could not parse static HTML: {e}")
+            data = None
+
+        if data is not None:
+            return data
+
+        # Not in the static HTML, the page may have been rendered by JS
+        if driver is not None:
+            return self.fetch_rendered(driver)
+
+        driver = self.setup_driver()
+        try:
+            return self.fetch_rendered(driver)
+        finally:
+            driver.quit()
+
+    def fetch_static(self):
+        response = requests.get(self.url, timeout=10)
+        response.raise_for_status()
+
+        doc = lxml.html.fromstring(response.content, parser=_HTML_PARSER)
+        for el in doc.cssselect(_AREA_SELECTOR):
+            if _BAZENY in el.text_content():
+                time_spans = el.cssselect("span.time")
+                if time_spans:
+                    return time_spans[0].text_content().strip()
+
+        return None
+
+    def fetch_rendered(self, driver):
         driver.get(self.url)
 
         # Wait for the element
         wait = WebDriverWait(driver, 20)
         wait.until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "#info-ticket-collapse .col.area.person")
-            )
+            EC.presence_of_element_located((By.CSS_SELECTOR, _AREA_SELECTOR))
         )
 
-        elements = driver.find_elements(
-            By.CSS_SELECTOR, "#info-ticket-collapse .col.area.person"
-        )
+        # Pull every area's text and time in one round-trip, not per element
+        areas = driver.execute_script(AREAS_SCRIPT)
 
-        for el in elements:
-            if "BAZÉNY" in el.text:
-                try:
-                    time_span = el.find_element(By.CSS_SELECTOR, "span.time")
-                    return time_span.text
-                except Exception as e:
-                    print(f"[{self.source_name}] Error extracting text: {e}")
+        for text, time_text in areas or []:
+            if _BAZENY in text:
+                if time_text is None:
+                    print(
+                        f"[{self.source_name}] Error extracting text: "
+                        "no span.time"
+                    )
                     continue
+                return time_text
 
         return None
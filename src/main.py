@@ -1,6 +1,9 @@
 import argparse
+import concurrent.futures
 import sys
 import os
+import signal
+import time
 
 # Add the src directory to the python path so we can import crawlers
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -8,6 +11,17 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from crawlers.luzanky import LuzankyCrawler
 from crawlers.hangar import HangarCrawler
 
+CRAWLERS = {
+    "luzanky": LuzankyCrawler,
+    "hangar": HangarCrawler,
+}
+
+
+def _fetch_row(name):
+    crawler = CRAWLERS[name]()
+    print(f"Running crawler for {crawler.source_name}...")
+    return crawler.fetch_row()
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -15,21 +29,56 @@ def main():
     )
     parser.add_argument(
         "--source",
-        choices=["luzanky", "hangar", "all"],
+        choices=[*CRAWLERS, "all"],
         default="all",
         help="Source to crawl (default: all)",
     )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="Keep running and crawl every INTERVAL seconds "
+        "(default: run once)",
+    )
     args = parser.parse_args()
 
-    crawlers = []
-    if args.source in ["luzanky", "all"]:
-        crawlers.append(LuzankyCrawler())
-    if args.source in ["hangar", "all"]:
-        crawlers.append(HangarCrawler())
+    names = list(CRAWLERS) if args.source == "all" else [args.source]
+    crawlers = {name: CRAWLERS[name]() for name in names}
+
+    # In loop mode keep the CSV files open and only flush every few rows
+    if args.interval is not None:
+        # Turn SIGTERM into a normal exit so buffered rows get flushed
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        for crawler in crawlers.values():
+            crawler.open_log()
+
+    # Crawl all sources concurrently. Each worker process owns its own
+    # browser, since a WebDriver session can't be shared across processes.
+    executor = None
+    if len(names) > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=len(names),
+        )
+
+    try:
+        while True:
+            if executor:
+                results = list(executor.map(_fetch_row, names))
+            else:
+                results = [_fetch_row(names[0])]
+
+            # Write only once every sample is in, one batch per source CSV
+            for name, row in zip(names, results):
+                crawlers[name].log_many([row] if row else [])
 
-    for crawler in crawlers:
-        print(f"Running crawler for {crawler.source_name}...")
-        crawler.run()
+            if args.interval is None:
+                break
+            time.sleep(args.interval)
+    finally:
+        if executor:
+            executor.shutdown()
+        for crawler in crawlers.values():
+            crawler.close_log()
 
 
 if __name__ == "__main__":
@@ -1,34 +1,84 @@
+import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
+import requests
+from selenium.common.exceptions import SessionNotCreatedException
+from src.crawlers import base
 from src.crawlers.luzanky import LuzankyCrawler
 from src.crawlers.hangar import HangarCrawler
 
 
+LUZANKY_HTML = """
+<html><body><div id="info-ticket-collapse">
+  <div class="col area person">SAUNA <span class="time">3/20</span></div>
+  <div class="col area person">BAZÉNY <span class="time">136/634</span></div>
+</div></body></html>
+""".encode("utf-8")
+
+
 class TestLuzankyCrawler(unittest.TestCase):
+    @patch("src.crawlers.luzanky.requests.get")
+    def test_fetch_static_success(self, mock_get):
+        mock_get.return_value.content = LUZANKY_HTML
+        mock_driver = MagicMock()
+
+        crawler = LuzankyCrawler()
+        result = crawler.fetch_data(mock_driver)
+
+        self.assertEqual(result, "136/634")
+        mock_driver.get.assert_not_called()
+
+    @patch("src.crawlers.luzanky.requests.get")
+    def test_fetch_static_tolerates_bad_bytes_and_xml_declaration(self, mock_get):
+        mock_get.return_value.content = (
+            b'<?xml version="1.0" encoding="utf-8"?>\xff' + LUZANKY_HTML
+        )
+
+        self.assertEqual(LuzankyCrawler().fetch_static(), "136/634")
+
+    @patch("src.crawlers.luzanky.requests.get")
     @patch("src.crawlers.base.webdriver.Chrome")
-    def test_fetch_occupancy_success(self, mock_driver_cls):
-        # Mock the driver and elements
+    def test_static_parse_error_falls_back_to_browser(self, mock_driver_cls, mock_get):
+        mock_get.return_value.content = b""
         mock_driver = mock_driver_cls.return_value
+        mock_driver.execute_script.return_value = [["BAZÉNY", "10/50"]]
 
-        # Mock finding elements
-        mock_element = MagicMock()
-        mock_element.text = "BAZÉNY"
+        self.assertEqual(LuzankyCrawler().fetch_data(mock_driver), "10/50")
 
-        mock_time_span = MagicMock()
-        mock_time_span.text = "10/50"
+    @patch("src.crawlers.luzanky.requests.get")
+    @patch("src.crawlers.base.webdriver.Chrome")
+    def test_request_error_skips_browser(self, mock_driver_cls, mock_get):
+        mock_get.side_effect = requests.ConnectionError("DNS failure")
 
-        mock_element.find_element.return_value = mock_time_span
-        mock_driver.find_elements.return_value = [mock_element]
+        self.assertIsNone(LuzankyCrawler().fetch_data())
+        mock_driver_cls.assert_not_called()
+
+    @patch("src.crawlers.luzanky.requests.get")
+    @patch("src.crawlers.base.webdriver.Chrome")
+    def test_fetch_occupancy_success(self, mock_driver_cls, mock_get):
+        # Static HTML lacks the element, so the crawler falls back to Selenium
+        mock_get.return_value.content = b"<html><body></body></html>"
+        mock_driver = mock_driver_cls.return_value
+
+        # All area texts come back from a single script call
+        mock_driver.execute_script.return_value = [
+            ["SAUNA", "3/20"],
+            ["BAZÉNY", "10/50"],
+        ]
 
         crawler = LuzankyCrawler()
         result = crawler.fetch_data(mock_driver)
 
         self.assertEqual(result, "10/50")
+        mock_driver.execute_script.assert_called_once()
 
+    @patch("src.crawlers.luzanky.requests.get")
     @patch("src.crawlers.base.webdriver.Chrome")
-    def test_fetch_occupancy_no_data(self, mock_driver_cls):
+    def test_fetch_occupancy_no_data(self, mock_driver_cls, mock_get):
+        mock_get.return_value.content = b"<html><body></body></html>"
         mock_driver = mock_driver_cls.return_value
-        mock_driver.find_elements.return_value = []
+        mock_driver.execute_script.return_value = []
 
         crawler = LuzankyCrawler()
         result = crawler.fetch_data(mock_driver)
@@ -37,24 +87,168 @@ class TestLuzankyCrawler(unittest.TestCase):
 
 
 class TestHangarCrawler(unittest.TestCase):
-    @patch("src.crawlers.base.webdriver.Chrome")
-    def test_fetch_occupancy_success(self, mock_driver_cls):
-        mock_driver = mock_driver_cls.return_value
+    def test_fetch_occupancy_success(self):
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = [
+            "Current occupancy\nOpen! Plenty of space...",
+            None,
+        ]
 
-        # Mock finding the label element
-        mock_label = MagicMock()
+        crawler = HangarCrawler()
+        result = crawler.fetch_data(mock_driver)
 
-        # Mock parent element
-        mock_parent = MagicMock()
-        mock_parent.text = "Current occupancy Open! Plenty of space..."
+        self.assertEqual(result, "Open! Plenty of space...")
+        mock_driver.execute_script.assert_called_once()
 
-        mock_label.find_element.return_value = mock_parent
-        mock_driver.find_element.return_value = mock_label
+    def test_fetch_occupancy_following_element(self):
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = [
+            "Current occupancy",
+            "The Hangar is buzzing!",
+        ]
 
         crawler = HangarCrawler()
         result = crawler.fetch_data(mock_driver)
 
-        self.assertEqual(result, "Open! Plenty of space...")
+        self.assertEqual(result, "The Hangar is buzzing!")
+
+    def test_fetch_occupancy_label_missing(self):
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = None
+
+        crawler = HangarCrawler()
+        self.assertIsNone(crawler.fetch_data(mock_driver))
+
+
+class TestBaseCrawler(unittest.TestCase):
+    @patch.object(LuzankyCrawler, "log_many")
+    @patch.object(LuzankyCrawler, "fetch_data", return_value="10/50")
+    @patch("src.crawlers.base.webdriver.Chrome")
+    def test_fetch_and_log_skips_browser_when_not_needed(
+        self, mock_driver_cls, mock_fetch, mock_log
+    ):
+        LuzankyCrawler().fetch_and_log()
+
+        mock_driver_cls.assert_not_called()
+        mock_fetch.assert_called_once_with(None)
+        mock_log.assert_called_once_with([(ANY, "10/50")])
+
+    def test_log_many_writes_header_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            crawler = LuzankyCrawler(data_dir=tmpdir)
+            crawler.log_many([("2025-12-10T08:00:00", "10/50")])
+            crawler.log_many(
+                [("2025-12-10T09:00:00", "20/50"), ("2025-12-10T10:00:00", "30/50")]
+            )
+
+            with open(crawler.csv_file) as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(
+            lines,
+            [
+                "timestamp,occupancy",
+                "2025-12-10T08:00:00,10/50",
+                "2025-12-10T09:00:00,20/50",
+                "2025-12-10T10:00:00,30/50",
+            ],
+        )
+
+    @patch("src.crawlers.base.webdriver.Chrome")
+    def test_setup_driver_applies_extra_args(self, mock_driver_cls):
+        LuzankyCrawler(service=MagicMock()).setup_driver()
+
+        options = mock_driver_cls.call_args.kwargs["options"]
+        self.assertIn("--blink-settings=imagesEnabled=false", options.arguments)
+        for arg in LuzankyCrawler.extra_args:
+            self.assertIn(arg, options.arguments)
+
+    def test_log_many_writes_header_into_empty_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            crawler = LuzankyCrawler(data_dir=tmpdir)
+            open(crawler.csv_file, "w").close()
+
+            crawler.log_many([("2025-12-10T08:00:00", "10/50")])
+            with patch("src.crawlers.base.os.path.isfile") as mock_isfile:
+                crawler.log_many([("2025-12-10T09:00:00", "20/50")])
+
+            with open(crawler.csv_file) as f:
+                lines = f.read().splitlines()
+
+        mock_isfile.assert_not_called()
+        self.assertEqual(lines[0], "timestamp,occupancy")
+        self.assertEqual(len(lines), 3)
+
+    def test_open_log_buffers_until_flush_threshold(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            crawler = LuzankyCrawler(data_dir=tmpdir)
+            crawler.open_log(flush_every=2)
+
+            crawler.log_many([("2025-12-10T08:00:00", "10/50")])
+            with open(crawler.csv_file) as f:
+                self.assertEqual(f.read(), "")
+
+            crawler.log_many([("2025-12-10T09:00:00", "20/50")])
+            with open(crawler.csv_file) as f:
+                self.assertEqual(len(f.read().splitlines()), 3)
+
+            crawler.log_many([("2025-12-10T10:00:00", "30/50")])
+            crawler.close_log()
+            with open(crawler.csv_file) as f:
+                self.assertEqual(len(f.read().splitlines()), 4)
+
+
+class TestDriverPath(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmpdir.name, "driver_path")
+        self.driver_file = os.path.join(self.tmpdir.name, "chromedriver")
+        open(self.driver_file, "w").close()
+
+        patcher = patch.multiple(
+            base, _DRIVER_PATH=None, _DRIVER_PATH_CACHE=self.cache_file
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    @patch("src.crawlers.base.ChromeDriverManager")
+    def test_driver_path_resolved_once(self, mock_manager_cls):
+        mock_manager_cls.return_value.install.return_value = self.driver_file
+
+        self.assertEqual(base._get_driver_path(), self.driver_file)
+        self.assertEqual(base._get_driver_path(), self.driver_file)
+
+        mock_manager_cls.return_value.install.assert_called_once()
+        with open(self.cache_file) as f:
+            self.assertEqual(f.read(), self.driver_file)
+
+    @patch("src.crawlers.base.ChromeDriverManager")
+    def test_driver_path_read_from_disk_cache(self, mock_manager_cls):
+        with open(self.cache_file, "w") as f:
+            f.write(self.driver_file)
+
+        self.assertEqual(base._get_driver_path(), self.driver_file)
+        mock_manager_cls.assert_not_called()
+
+    @patch("src.crawlers.base.webdriver.Chrome")
+    @patch("src.crawlers.base.ChromeDriverManager")
+    def test_stale_driver_path_resolved_again(self, mock_manager_cls, mock_driver_cls):
+        stale_file = os.path.join(self.tmpdir.name, "chromedriver-old")
+        open(stale_file, "w").close()
+        with open(self.cache_file, "w") as f:
+            f.write(stale_file)
+        mock_manager_cls.return_value.install.return_value = self.driver_file
+        driver = MagicMock()
+        mock_driver_cls.side_effect = [SessionNotCreatedException("version"), driver]
+
+        self.assertIs(base.setup_driver(), driver)
+
+        mock_manager_cls.return_value.install.assert_called_once()
+        services = [c.kwargs["service"] for c in mock_driver_cls.call_args_list]
+        self.assertEqual(services[1].path, self.driver_file)
+        with open(self.cache_file) as f:
+            self.assertEqual(f.read(), self.driver_file)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,96 @@
+import concurrent.futures
+import functools
+import signal
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src import main
+
+# main imports the crawlers through src/ on sys.path, as "crawlers"
+from crawlers.base import BaseCrawler
+
+
+def fake_fetch_row(crawler):
+    return ("2025-12-10T08:00:00", f"{crawler.source_name} data")
+
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+        crawlers = {
+            name: functools.partial(cls, data_dir=self.tmpdir.name)
+            for name, cls in main.CRAWLERS.items()
+        }
+        for patcher in (
+            patch.dict(main.CRAWLERS, crawlers),
+            patch.object(
+                BaseCrawler, "fetch_row", autospec=True, side_effect=fake_fetch_row
+            ),
+            # Patches don't reach worker processes, threads run the same code
+            patch.object(
+                concurrent.futures,
+                "ProcessPoolExecutor",
+                concurrent.futures.ThreadPoolExecutor,
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def read_csv(self, name):
+        with open(main.CRAWLERS[name]().csv_file) as f:
+            return f.read().splitlines()
+
+    def run_main(self, *args):
+        with patch.object(sys, "argv", ["main.py", *args]):
+            main.main()
+
+    def test_single_shot_crawls_each_source_once(self):
+        self.run_main("--source", "all")
+
+        for name in main.CRAWLERS:
+            self.assertEqual(
+                self.read_csv(name),
+                ["timestamp,occupancy", f"2025-12-10T08:00:00,{name} data"],
+            )
+
+    def test_single_source(self):
+        self.run_main("--source", "hangar")
+
+        self.assertEqual(len(self.read_csv("hangar")), 2)
+        self.assertEqual(BaseCrawler.fetch_row.call_count, 1)
+
+    # The spy also keeps the crawlers alive, so GC can't close the files
+    @patch.object(
+        BaseCrawler, "close_log", autospec=True, side_effect=BaseCrawler.close_log
+    )
+    @patch("src.main.time.sleep")
+    @patch("src.main.signal.signal")
+    def test_loop_flushes_buffered_rows_on_sigterm(
+        self, mock_signal, mock_sleep, mock_close
+    ):
+        def sleep(_):
+            # SIGTERM arrives during the third sleep
+            if mock_sleep.call_count == 3:
+                handler = mock_signal.call_args.args[1]
+                handler(signal.SIGTERM, None)
+
+        mock_sleep.side_effect = sleep
+
+        with self.assertRaises(SystemExit) as cm:
+            self.run_main("--source", "all", "--interval", "60")
+
+        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(mock_signal.call_args.args[0], signal.SIGTERM)
+        mock_sleep.assert_called_with(60.0)
+        self.assertEqual(mock_close.call_count, len(main.CRAWLERS))
+        # Fewer rows than CSV_FLUSH_EVERY, so only close_log() wrote them
+        for name in main.CRAWLERS:
+            self.assertEqual(len(self.read_csv(name)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
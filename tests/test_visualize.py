@@ -0,0 +1,412 @@
+import csv
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import visualize_hangar_crowd as hangar
+import visualize_luzanky_crowd as luzanky
+
+OPEN = "Open! Plenty of space, hardly anyone around – all yours."
+BUZZING = "The Hangar is buzzing! Full-on bouldering vibes, expect a bit of a squeeze."
+CLOSED = "Closed for now – check out the opening hours in the Contacts section."
+STATES = [CLOSED, OPEN, BUZZING, "Weird new state"]
+
+
+def sample_rows(n):
+    # Every 97 minutes cycles through all days and hours; one state per row
+    start = pd.Timestamp("2025-12-01T00:00:00")
+    return [
+        ((start + pd.Timedelta(minutes=97 * i)).isoformat(), STATES[i % 7 % 4])
+        for i in range(n)
+    ]
+
+
+def write_csv(path, rows, header=("timestamp", "occupancy"), mode="w"):
+    # Quoted like the crawler's csv.writer; the states contain commas
+    with open(path, mode, newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+class TestHangarLoadData(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.csv_file = os.path.join(self.tmpdir.name, "hangar.csv")
+
+    def test_header_is_normalized(self):
+        write_csv(
+            self.csv_file,
+            [("2025-12-08T10:00:00", OPEN), ("2025-12-08T11:00:00", BUZZING)],
+            header=(" Timestamp ", "OCCUPANCY"),
+        )
+
+        df = hangar.load_data(self.csv_file, use_cache=False)
+
+        self.assertEqual(df["occupancy_level"].tolist(), [1, 3])
+        self.assertEqual(df["hour"].tolist(), [10, 11])
+
+    def load_cached(self):
+        cache_file = os.path.splitext(self.csv_file)[0] + ".parquet"
+        df = hangar.load_data(self.csv_file)
+        _, offset = hangar._read_cache(cache_file)
+        return df, offset
+
+    def assert_matches_fresh_parse(self, df):
+        fresh = hangar.load_data(self.csv_file, use_cache=False)
+        pd.testing.assert_frame_equal(
+            df.reset_index(drop=True), fresh.reset_index(drop=True), check_dtype=False
+        )
+
+    def test_cache_only_parses_appended_rows(self):
+        rows = sample_rows(20)
+        write_csv(self.csv_file, rows[:12])
+        _, offset = self.load_cached()
+        self.assertEqual(offset, os.path.getsize(self.csv_file))
+
+        write_csv(self.csv_file, rows[12:], header=None, mode="a")
+        with patch.object(
+            hangar, "_read_csv_bytes", wraps=hangar._read_csv_bytes
+        ) as mock_read:
+            df, offset = self.load_cached()
+
+        mock_read.assert_called_once()
+        data, has_header = mock_read.call_args.args
+        self.assertFalse(has_header)
+        self.assertEqual(len(data.splitlines()), 8)
+        self.assertEqual(offset, os.path.getsize(self.csv_file))
+        self.assert_matches_fresh_parse(df)
+
+    def test_unterminated_last_line_is_not_cached(self):
+        write_csv(self.csv_file, sample_rows(5))
+        size_before_partial = os.path.getsize(self.csv_file)
+        # The crawler is mid-write, inside the quoted state
+        with open(self.csv_file, "a", encoding="utf-8") as f:
+            f.write('2025-12-09T10:00:00,"Open! Plenty')
+
+        df, offset = self.load_cached()
+        self.assertEqual(offset, size_before_partial)
+        self.assertEqual(len(df), 4)  # one of the 5 rows is an unknown state
+
+        # The crawler finishes the line; it must be parsed whole, once
+        with open(self.csv_file, "a", encoding="utf-8") as f:
+            f.write(' of space, hardly anyone around – all yours."\r\n')
+        df, offset = self.load_cached()
+
+        self.assertEqual(offset, os.path.getsize(self.csv_file))
+        self.assertEqual(df["occupancy_level"].iat[-1], 1)
+        self.assert_matches_fresh_parse(df)
+
+    def test_complete_unterminated_row_is_returned_but_not_cached(self):
+        write_csv(self.csv_file, sample_rows(5))
+        size_before_partial = os.path.getsize(self.csv_file)
+        with open(self.csv_file, "a", encoding="utf-8") as f:
+            f.write(f'2025-12-09T10:00:00,"{BUZZING}"')
+
+        df, offset = self.load_cached()
+
+        self.assertEqual(offset, size_before_partial)
+        self.assertEqual(df["occupancy_level"].iat[-1], 3)
+        self.assert_matches_fresh_parse(df)
+
+    def test_mapping_change_discards_cache(self):
+        new_state = "Weird new state"
+        write_csv(self.csv_file, [("2025-12-08T10:00:00", new_state)] * 2)
+        df, _ = self.load_cached()
+        self.assertTrue(df.empty)
+
+        # The usual fix for the unknown state warning
+        mapping = {**hangar.OCCUPANCY_MAPPING, new_state: 2}
+        with patch.multiple(
+            hangar,
+            OCCUPANCY_MAPPING=mapping,
+            OCCUPANCY_STATES=pd.Index(list(mapping)),
+            OCCUPANCY_LEVELS=np.array(list(mapping.values()), dtype="int8"),
+        ):
+            df, _ = self.load_cached()
+
+        self.assertEqual(df["occupancy_level"].tolist(), [2, 2])
+
+    def test_header_only_file(self):
+        for header in ("timestamp,occupancy", "timestamp,occupancy\n"):
+            with open(self.csv_file, "w") as f:
+                f.write(header)
+
+            df, _ = self.load_cached()
+            self.assertTrue(df.empty)
+
+        write_csv(self.csv_file, sample_rows(3), header=None, mode="a")
+        df, _ = self.load_cached()
+        self.assertEqual(len(df), 3)
+        self.assert_matches_fresh_parse(df)
+
+    def test_truncated_csv_discards_cache(self):
+        rows = sample_rows(20)
+        write_csv(self.csv_file, rows)
+        self.load_cached()
+
+        write_csv(self.csv_file, rows[:3])
+        df, offset = self.load_cached()
+
+        self.assertEqual(offset, os.path.getsize(self.csv_file))
+        self.assertEqual(len(df), 3)
+        self.assert_matches_fresh_parse(df)
+
+
+class TestHangarStreamData(unittest.TestCase):
+    def test_stream_matches_in_memory_aggregates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = os.path.join(tmpdir, "hangar.csv")
+            write_csv(csv_file, sample_rows(500))
+
+            df = hangar.load_data(csv_file, use_cache=False)
+            counts, pivot_df = hangar.summarize(df)
+            with self.assertLogs(level="WARNING") as logs:
+                sample, stream_counts, stream_pivot = hangar.stream_data(
+                    csv_file, chunksize=37
+                )
+
+        pd.testing.assert_series_equal(stream_counts, counts, check_names=False)
+        pd.testing.assert_frame_equal(
+            stream_pivot,
+            pivot_df,
+            check_dtype=False,
+            check_column_type=False,
+            check_names=False,
+        )
+        self.assertEqual(len(sample), len(df))
+        # Unknown states are reported once, not once per chunk
+        self.assertEqual(len(logs.records), 1)
+
+    def test_stream_handles_missing_occupancy(self):
+        rows = sample_rows(100)
+        rows[10] = (rows[10][0], "")
+        rows[80] = (rows[80][0], "N/A")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = os.path.join(tmpdir, "hangar.csv")
+            write_csv(csv_file, rows)
+
+            df = hangar.load_data(csv_file, use_cache=False)
+            with self.assertLogs(level="WARNING") as logs:
+                sample, counts, _ = hangar.stream_data(csv_file, chunksize=30)
+
+        self.assertEqual(int(counts.sum()), len(df))
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("nan", logs.output[0])
+
+
+class TestLuzankyLoadData(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.csv_file = os.path.join(self.tmpdir.name, "luzanky.csv")
+
+    def test_header_is_normalized(self):
+        write_csv(
+            self.csv_file,
+            [("2025-12-08T10:00:00", "136/634"), ("2025-12-08T11:00:00", "0/634")],
+            header=(" Timestamp ", "OCCUPANCY"),
+        )
+
+        df = luzanky.load_data(self.csv_file)
+
+        self.assertEqual(df["current"].tolist(), [136, 0])
+        self.assertEqual(df["hour"].tolist(), [10, 11])
+
+    def load_cached(self):
+        cache_file = os.path.splitext(self.csv_file)[0] + ".parquet"
+        df = luzanky.load_data(self.csv_file)
+        _, offset = luzanky._read_cache(cache_file)
+        return df, offset
+
+    def assert_matches_fresh_parse(self, df):
+        fresh = luzanky.load_data(self.csv_file, use_cache=False)
+        pd.testing.assert_frame_equal(df, fresh, check_dtype=False)
+
+    def test_cache_only_parses_appended_rows(self):
+        rows = [(ts, f"{i}/634") for i, (ts, _) in enumerate(sample_rows(20))]
+        write_csv(self.csv_file, rows[:12])
+        _, offset = self.load_cached()
+        self.assertEqual(offset, os.path.getsize(self.csv_file))
+
+        write_csv(self.csv_file, rows[12:], header=None, mode="a")
+        with patch.object(luzanky, "_read_csv", wraps=luzanky._read_csv) as mock_read:
+            df, offset = self.load_cached()
+
+        mock_read.assert_called_once()
+        self.assertEqual(len(mock_read.call_args.args[0].splitlines()), 8)
+        self.assertEqual(offset, os.path.getsize(self.csv_file))
+        self.assertEqual(df["current"].tolist(), list(range(20)))
+        self.assert_matches_fresh_parse(df)
+
+    def test_unterminated_last_line_is_not_cached(self):
+        write_csv(self.csv_file, [("2025-12-08T10:00:00", "136/634")])
+        size_before_partial = os.path.getsize(self.csv_file)
+        # The crawler is mid-write
+        with open(self.csv_file, "a", encoding="utf-8") as f:
+            f.write("2025-12-08T11:00:00,140/")
+
+        df, offset = self.load_cached()
+        self.assertEqual(offset, size_before_partial)
+        self.assertEqual(df["current"].tolist(), [136])
+
+        with open(self.csv_file, "a", encoding="utf-8") as f:
+            f.write("634")
+        df, offset = self.load_cached()
+        self.assertEqual(offset, size_before_partial)
+        self.assertEqual(df["current"].tolist(), [136, 140])
+
+        with open(self.csv_file, "a", encoding="utf-8") as f:
+            f.write("\r\n")
+        df, offset = self.load_cached()
+        self.assertEqual(offset, os.path.getsize(self.csv_file))
+        self.assert_matches_fresh_parse(df)
+
+    def test_truncated_csv_discards_cache(self):
+        rows = [(ts, "5/634") for ts, _ in sample_rows(20)]
+        write_csv(self.csv_file, rows)
+        self.load_cached()
+
+        write_csv(self.csv_file, rows[:3])
+        df, offset = self.load_cached()
+
+        self.assertEqual(offset, os.path.getsize(self.csv_file))
+        self.assertEqual(len(df), 3)
+        self.assert_matches_fresh_parse(df)
+
+    def test_calendar_keys_match_dt_accessor(self):
+        rows = [(ts, "5/634") for ts, _ in sample_rows(200)]
+        rows.insert(50, ("", "200/634"))
+        write_csv(self.csv_file, rows)
+
+        df = luzanky.load_data(self.csv_file, use_cache=False)
+
+        self.assertEqual(len(df), 200)
+        self.assertNotIn(200, df["current"].tolist())
+        self.assertEqual(df["dow"].tolist(), df["timestamp"].dt.dayofweek.tolist())
+        self.assertEqual(df["hour"].tolist(), df["timestamp"].dt.hour.tolist())
+
+    def test_missing_column_exits(self):
+        write_csv(self.csv_file, [("2025-12-08T10:00:00",)], header=("timestamp",))
+
+        with self.assertRaises(SystemExit), self.assertLogs(level="ERROR"):
+            luzanky.load_data(self.csv_file)
+
+
+class TestLuzankyStreamData(unittest.TestCase):
+    def test_stream_matches_in_memory_aggregates(self):
+        rows = [
+            (ts, f"{i * 7 % 300}/634" if i % 11 else "n/a")
+            for i, (ts, _) in enumerate(sample_rows(500))
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = os.path.join(tmpdir, "luzanky.csv")
+            write_csv(csv_file, rows, header=(" Timestamp ", "OCCUPANCY"))
+
+            df = luzanky.load_data(csv_file, use_cache=False)
+            dh = luzanky.aggregate_day_hour(df)
+            with self.assertLogs(level="WARNING") as logs:
+                sample, stream_dh = luzanky.stream_data(
+                    csv_file, chunksize=37, sample_size=20
+                )
+
+        pd.testing.assert_frame_equal(
+            stream_dh.sort_index(), dh.sort_index(), check_dtype=False
+        )
+        # The first, last and busiest rows are kept on top of the sample
+        self.assertLessEqual(len(sample), 23)
+        self.assertEqual(sample["timestamp"].iat[0], df["timestamp"].min())
+        self.assertEqual(sample["timestamp"].iat[-1], df["timestamp"].max())
+        self.assertEqual(sample["current"].max(), df["current"].max())
+        # Bad rows are reported once, not once per chunk
+        self.assertEqual(len(logs.records), 1)
+
+    def test_stream_chunk_without_occupancy(self):
+        rows = [(ts, "5/634" if i < 50 else "") for i, (ts, _) in enumerate(sample_rows(100))]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_file = os.path.join(tmpdir, "luzanky.csv")
+            write_csv(csv_file, rows)
+
+            df = luzanky.load_data(csv_file, use_cache=False)
+            with self.assertLogs(level="WARNING"):
+                _, stream_dh = luzanky.stream_data(csv_file, chunksize=50)
+
+        self.assertEqual(len(df), 50)
+        self.assertEqual(stream_dh["count"].sum(), 50)
+
+
+class TestLuzankySplitOccupancy(unittest.TestCase):
+    CASES = [
+        "136/634",
+        "0/0",
+        "00012/0634",
+        " 5/6 ",
+        "\t5/6\r\n",
+        "\x1c5/6\x1f",
+        "\x0b5/6\x0c",
+        "5/6\x00",
+        "5\x00/6",
+        "\x005/6",
+        "",
+        "5/",
+        "/6",
+        "5 /6",
+        "5/ 6",
+        "5/6/7",
+        "5/6 7",
+        "a5/6",
+        "5/6a",
+        "-5/6",
+        "32767/32767",
+        "32768/634",
+        "40000/634",
+        "1/32768",
+        "99999999999999999999/634",
+        "634/99999999999999999999",
+        "\xa05/6",
+        "５/6",
+        None,
+    ]
+
+    def split(self, values, kernel):
+        # The plain Python kernel behaves like the numba-compiled one
+        parse = luzanky._parse_occupancy_kernel if kernel else None
+        with patch.object(luzanky, "_parse_occupancy", parse):
+            nums = luzanky._split_occupancy(pd.Series(values, dtype="str"))
+        return nums.astype("float64").to_numpy()
+
+    def test_kernel_matches_regex(self):
+        for value in self.CASES:
+            with self.subTest(value=value):
+                np.testing.assert_array_equal(
+                    self.split([value], kernel=True), self.split([value], kernel=False)
+                )
+
+        ascii_cases = [v for v in self.CASES if v is None or v.isascii()]
+        np.testing.assert_array_equal(
+            self.split(ascii_cases, kernel=True), self.split(ascii_cases, kernel=False)
+        )
+
+    def test_out_of_range_rows_are_dropped(self):
+        df = pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime(["2025-12-08T10:00", "2025-12-08T11:00"]),
+                "occupancy": ["40000/634", "136/634"],
+            }
+        )
+
+        with self.assertLogs(level="WARNING"):
+            df = luzanky._add_counts(df)
+
+        self.assertEqual(df["current"].tolist(), [136])
+        self.assertEqual(df["current"].dtype, "int16")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,12 +8,19 @@ showing average occupancy by hour of the day and day of the week.
 """
 
 import argparse
+import csv
+import io
+import json
 import logging
+import os
 import sys
 
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import seaborn as sns
 
 # Configure logging
@@ -23,6 +30,15 @@ logging.basicConfig(
 
 # Constants
 DEFAULT_CSV_PATH = "data/hangar.csv"
+CSV_COLUMNS = ["timestamp", "occupancy"]
+# Parquet metadata key holding how many CSV bytes the cache covers
+CACHE_OFFSET_KEY = b"csv_offset"
+# Parquet metadata key holding the OCCUPANCY_MAPPING the cache was built with
+CACHE_MAPPING_KEY = b"occupancy_mapping"
+# Rows kept for the time-series plot when streaming (--chunksize)
+SAMPLE_SIZE = 50_000
+# Time bin for decimating the occupancy scatter plot
+SCATTER_BIN = "10min"
 OUTPUT_FILENAME = "hangar_plots.png"
 
 # Mapping of occupancy text to numerical levels
@@ -33,6 +49,20 @@ OCCUPANCY_MAPPING = {
     "The Hangar is buzzing! Full-on bouldering vibes, expect a bit of a squeeze.": 3,
 }
 
+# Lookup arrays for vectorized mapping: category code -> occupancy level
+OCCUPANCY_STATES = pd.Index(list(OCCUPANCY_MAPPING))
+OCCUPANCY_LEVELS = np.array(list(OCCUPANCY_MAPPING.values()), dtype="int8")
+
+DAYS_ORDER = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
 # Reverse mapping for labels
 LEVEL_LABELS = {
     0: "Closed",
@@ -42,63 +72,402 @@ LEVEL_LABELS = {
 }
 
 
-def load_data(file_path: str) -> pd.DataFrame:
+def load_data(file_path: str, use_cache: bool = True) -> pd.DataFrame:
     """
     Load and preprocess the CSV data.
 
+    The processed frame is cached in a Parquet file next to the CSV, along
+    with how many bytes of the CSV it covers. Later runs only parse the rows
+    appended since then.
+
     Args:
         file_path: Path to the CSV file.
+        use_cache: Whether to read and update the Parquet cache.
 
     Returns:
         Processed DataFrame with 'timestamp' and 'occupancy_level'.
     """
+    cache_path = os.path.splitext(file_path)[0] + ".parquet"
+    cached, offset = _read_cache(cache_path) if use_cache else (None, 0)
+
     try:
-        df = pd.read_csv(file_path)
+        with open(file_path, "rb") as f:
+            if offset > os.fstat(f.fileno()).st_size:
+                # The CSV was truncated or replaced, start over
+                cached, offset = None, 0
+            f.seek(offset)
+            data = f.read()
     except FileNotFoundError:
         logging.error(f"File not found: {file_path}")
         sys.exit(1)
+
+    # Only cache complete lines, the crawler may be appending right now
+    complete_end = data.rfind(b"\n") + 1
+    complete, partial = data[:complete_end], data[complete_end:]
+
+    frames = [] if cached is None else [cached]
+    has_header = cached is None
+    if complete.strip():
+        frames.append(_prepare(_read_csv_bytes(complete, has_header)))
+        has_header = False
+    elif partial.strip() and has_header:
+        # A single line without a trailing newline is just the header
+        frames.append(_prepare(_read_csv_bytes(partial, has_header)))
+        partial = b""
+
+    if not frames:
+        logging.error(f"Error reading CSV: {file_path} is empty")
+        sys.exit(1)
+
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    if use_cache and complete:
+        _write_cache(cache_path, df, offset + complete_end)
+
+    if partial.strip():
+        partial_df = _read_partial_line(partial)
+        if partial_df is not None:
+            df = pd.concat([df, partial_df], ignore_index=True)
+
+    return df
+
+
+def _read_csv_bytes(data: bytes, has_header: bool) -> pd.DataFrame:
+    """
+    Parse raw CSV bytes into 'timestamp' and 'occupancy' columns.
+
+    Args:
+        data: CSV content, with or without the header line.
+        has_header: Whether data starts with the header line.
+
+    Returns:
+        Raw DataFrame.
+    """
+    names = CSV_COLUMNS
+    if has_header:
+        header, _, data = data.partition(b"\n")
+        names = _csv_columns(header)
+
+    if not data.strip():
+        # Only the header so far
+        return pd.DataFrame(columns=CSV_COLUMNS)
+
+    # The Arrow reader can't infer columns from a lone unterminated line
+    if not data.endswith(b"\n"):
+        data += b"\n"
+
+    try:
+        # The Arrow reader is multi-threaded and parses ISO timestamps in C++
+        df = pd.read_csv(
+            io.BytesIO(data),
+            engine="pyarrow",
+            header=None,
+            names=names,
+        )
+        return df[CSV_COLUMNS]
     except Exception as e:
         logging.error(f"Error reading CSV: {e}")
         sys.exit(1)
 
-    # Clean column names
-    df.columns = df.columns.str.strip().str.lower()
 
-    if "timestamp" not in df.columns or "occupancy" not in df.columns:
+def _read_partial_line(line: bytes) -> pd.DataFrame | None:
+    """
+    Parse an unterminated last data line, which may be cut off mid-write.
+
+    Args:
+        line: The bytes after the last newline.
+
+    Returns:
+        Processed DataFrame with the row, or None if the line is incomplete.
+    """
+    try:
+        df = pd.read_csv(
+            io.BytesIO(line + b"\n"),
+            engine="pyarrow",
+            header=None,
+            names=CSV_COLUMNS,
+        )
+        df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601")
+    except Exception:
+        logging.info("Skipping the incomplete last line of the CSV.")
+        return None
+    return _prepare(df)
+
+
+def _csv_columns(header: bytes) -> list[str]:
+    """
+    Normalize the CSV header line to lower-case, stripped column names.
+
+    Args:
+        header: The raw header line.
+
+    Returns:
+        Column names in file order.
+    """
+    names = [
+        name.strip().lower()
+        for row in csv.reader([header.decode("utf-8-sig")])
+        for name in row
+    ]
+    if "timestamp" not in names or "occupancy" not in names:
         logging.error("CSV must contain 'timestamp' and 'occupancy' columns.")
         sys.exit(1)
+    return names
+
+
+def _read_cache(cache_path: str) -> tuple[pd.DataFrame | None, int]:
+    """
+    Read the Parquet cache written by _write_cache.
+
+    Args:
+        cache_path: Path to the Parquet file.
+
+    Returns:
+        The cached processed DataFrame and the CSV byte offset it covers,
+        or (None, 0) if there is no usable cache.
+    """
+    if not os.path.isfile(cache_path):
+        return None, 0
+
+    try:
+        table = pq.read_table(cache_path)
+        metadata = table.schema.metadata
+        offset = int(metadata[CACHE_OFFSET_KEY])
+        mapping = metadata.get(CACHE_MAPPING_KEY)
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable cache {cache_path}: {e}")
+        return None, 0
+
+    # Rows with states that were unknown at the time are not in the cache
+    if mapping != _mapping_fingerprint():
+        logging.info("Occupancy mapping changed, rebuilding the cache.")
+        return None, 0
 
-    # Parse timestamp
+    df = table.to_pandas()
+
+    # Parquet only keeps the categories that occur (none for an empty
+    # frame), which would make concat with new rows fall back to object
+    df["day_name"] = df["day_name"].astype(pd.CategoricalDtype(DAYS_ORDER))
+    return df, offset
+
+
+def _write_cache(cache_path: str, df: pd.DataFrame, offset: int) -> None:
+    """
+    Write the processed DataFrame to a Parquet cache.
+
+    Args:
+        cache_path: Path to the Parquet file.
+        df: Processed DataFrame.
+        offset: Number of CSV bytes the DataFrame covers.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {
+        **(table.schema.metadata or {}),
+        CACHE_OFFSET_KEY: str(offset),
+        CACHE_MAPPING_KEY: _mapping_fingerprint(),
+    }
     try:
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        pq.write_table(
+            table.replace_schema_metadata(metadata),
+            cache_path,
+            compression="zstd",
+        )
+    except Exception as e:
+        # The cache is only an optimization
+        logging.warning(f"Could not write cache {cache_path}: {e}")
+
+
+def _mapping_fingerprint() -> bytes:
+    """
+    Serialize OCCUPANCY_MAPPING for the cache metadata.
+
+    Returns:
+        The mapping as JSON bytes.
+    """
+    return json.dumps(OCCUPANCY_MAPPING, sort_keys=True).encode()
+
+
+def _prepare(
+    df: pd.DataFrame, unknown_states: set | None = None
+) -> pd.DataFrame:
+    """
+    Parse timestamps, map occupancy to levels and derive calendar keys.
+
+    Args:
+        df: Raw DataFrame with 'timestamp' and 'occupancy' columns.
+        unknown_states: If given, unknown occupancy states are added to this
+            set instead of being logged, so chunked callers warn only once.
+
+    Returns:
+        Processed DataFrame.
+    """
+    # Parse timestamp (a no-op if Arrow already inferred the type). The
+    # crawler writes datetime.isoformat(), so skip per-row format guessing.
+    try:
+        df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601")
     except Exception as e:
         logging.error(f"Error parsing timestamps: {e}")
         sys.exit(1)
 
-    # Map occupancy to levels
-    df["occupancy_level"] = df["occupancy"].map(OCCUPANCY_MAPPING)
+    # Map occupancy to levels with one vectorized hash lookup (the same one
+    # Categorical uses to build codes). Unknown states get code -1.
+    codes = OCCUPANCY_STATES.get_indexer(df["occupancy"])
+    known = codes >= 0
+    levels = np.where(known, OCCUPANCY_LEVELS[codes], -1)
+    df["occupancy_level"] = levels.astype("int8")
 
     # Check for unmapped values
-    unknown_states = df[df["occupancy_level"].isna()]["occupancy"].unique()
-    if len(unknown_states) > 0:
-        logging.warning(f"Found unknown occupancy states: {unknown_states}")
+    if not known.all():
+        unknown = df.loc[~known, "occupancy"].unique()
+        if unknown_states is None:
+            logging.warning(f"Found unknown occupancy states: {unknown}")
+        else:
+            # As text, so missing cells (NaN) sort with the states
+            unknown_states.update(map(str, unknown))
         # Drop unknown states for plotting stability
-        df = df.dropna(subset=["occupancy_level"])
+        df = df[known]
 
-    # Cast to integer after dropping NaNs
-    df["occupancy_level"] = df["occupancy_level"].astype(int)
+    # The raw text isn't needed past this point
+    df = df.drop(columns="occupancy")
+
+    # Derive the calendar keys once; every aggregation below reuses them
+    df["day_name"] = pd.Categorical(
+        df["timestamp"].dt.day_name(), categories=DAYS_ORDER
+    )
+    df["hour"] = df["timestamp"].dt.hour.astype("int8")
 
     return df
 
 
-def analyze_data(df: pd.DataFrame) -> None:
+def stream_data(
+    file_path: str, chunksize: int, sample_size: int = SAMPLE_SIZE
+) -> tuple[pd.DataFrame, pd.Series, pd.DataFrame]:
+    """
+    Read the CSV in chunks, keeping only running aggregates in memory.
+
+    Args:
+        file_path: Path to the CSV file.
+        chunksize: Number of rows per chunk.
+        sample_size: Number of rows kept for the time-series plot.
+
+    Returns:
+        A uniform random sample of processed rows (always including the
+        first and last observation), counts per day over all rows, and the
+        day vs hour pivot of average occupancy during open hours.
+    """
+    day_counts = np.zeros(len(DAYS_ORDER), dtype="int64")
+    open_sums = np.zeros((len(DAYS_ORDER), 24), dtype="int64")
+    open_counts = np.zeros((len(DAYS_ORDER), 24), dtype="int64")
+    rng = np.random.default_rng()
+    sample = None
+    first = last = None
+    unknown_states = set()
+
+    try:
+        with open(file_path, "rb") as f:
+            names = _csv_columns(f.readline())
+
+        # The Arrow reader can't stream, so chunks come from the C parser
+        reader = pd.read_csv(
+            file_path,
+            chunksize=chunksize,
+            header=0,
+            names=names,
+            usecols=CSV_COLUMNS,
+        )
+        for chunk in reader:
+            chunk = _prepare(chunk, unknown_states)
+            if chunk.empty:
+                continue
+
+            days = chunk["day_name"].cat.codes.to_numpy()
+            hours = chunk["hour"].to_numpy()
+            levels = chunk["occupancy_level"].to_numpy()
+            day_counts += np.bincount(days, minlength=len(DAYS_ORDER))
+
+            is_open = levels > 0
+            keys = (days[is_open], hours[is_open])
+            np.add.at(open_sums, keys, levels[is_open])
+            np.add.at(open_counts, keys, 1)
+
+            # Reservoir sample: keep the rows with the smallest random keys
+            keyed = chunk.assign(_key=rng.random(len(chunk)))
+            if sample is not None:
+                keyed = pd.concat([sample, keyed])
+            sample = keyed.nsmallest(sample_size, "_key")
+
+            if first is None:
+                first = chunk.iloc[[0]]
+            last = chunk.iloc[[-1]]
+    except FileNotFoundError:
+        logging.error(f"File not found: {file_path}")
+        sys.exit(1)
+    except Exception as e:
+        logging.error(f"Error reading CSV: {e}")
+        sys.exit(1)
+
+    if unknown_states:
+        logging.warning(
+            f"Found unknown occupancy states: {sorted(unknown_states)}"
+        )
+
+    counts = pd.Series(day_counts, index=DAYS_ORDER, name="count")
+    counts.index.name = "day_name"
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = open_sums / open_counts
+    pivot_df = pd.DataFrame(means, index=DAYS_ORDER, columns=range(24))
+    # Like a pivot, only keep the hours that were actually observed
+    pivot_df = pivot_df.loc[:, open_counts.any(axis=0)]
+    pivot_df.index.name = "day_name"
+    pivot_df.columns.name = "hour"
+
+    if sample is None:
+        return pd.DataFrame(), counts, pivot_df
+
+    sample = pd.concat([first, sample.drop(columns="_key"), last])
+    sample = sample[~sample.index.duplicated()].sort_values("timestamp")
+    return sample, counts, pivot_df
+
+
+def summarize(df: pd.DataFrame) -> tuple[pd.Series, pd.DataFrame]:
+    """
+    Compute the aggregates shared by the text summary and the plots.
+
+    Args:
+        df: Processed DataFrame.
+
+    Returns:
+        Number of observations per day of the week (all data, to show
+        crawler health/frequency) and the day vs hour pivot of average
+        occupancy during open hours.
+    """
+    # Reindex to ensure all days show up even if 0
+    counts = df["day_name"].value_counts().reindex(DAYS_ORDER, fill_value=0)
+
+    # Only the three columns the aggregation needs; it is never mutated.
+    open_only_df = df.loc[
+        df["occupancy_level"] > 0, ["occupancy_level", "day_name", "hour"]
+    ]
+    pivot_df = open_only_df.pivot_table(
+        index="day_name",
+        columns="hour",
+        values="occupancy_level",
+        aggfunc="mean",
+        observed=True,
+    ).reindex(DAYS_ORDER)
+
+    return counts, pivot_df
+
+
+def analyze_data(df: pd.DataFrame, counts: pd.Series) -> None:
     """
     Print summary statistics and optimal visiting times.
 
     Args:
         df: Processed DataFrame.
+        counts: Counts per day, as returned by summarize.
     """
-    total_rows = len(df)
+    total_rows = int(counts.sum())
     if total_rows == 0:
         print("No data available for analysis.")
         return
@@ -115,58 +484,26 @@ def analyze_data(df: pd.DataFrame) -> None:
     print(f"Duration: {duration}")
     print("-" * 30)
 
-    # --- Heatmap Preparation ---
-    open_only_df = df[df["occupancy_level"] > 0].copy()
-
-    # Counts by day for availability plot
-    # Use all data to show crawler health/frequency
-    df["day_name"] = df["timestamp"].dt.day_name()
-    days_order = [
-        "Monday",
-        "Tuesday",
-        "Wednesday",
-        "Thursday",
-        "Friday",
-        "Saturday",
-        "Sunday",
-    ]
-
     # --- Print Stats ---
     print("\nDATA AVAILABILITY (Counts per Day)")
     print("-" * 30)
-    # Reindex to ensure all days show up even if 0
-    counts = df["day_name"].value_counts().reindex(days_order, fill_value=0)
     print(counts)
     print("-" * 30)
 
-    if not open_only_df.empty:
-        open_only_df["hour"] = open_only_df["timestamp"].dt.hour
-        open_only_df["day_name"] = open_only_df["timestamp"].dt.day_name()
-
-        # Aggregate for Heatmap
-        heatmap_data = (
-            open_only_df.groupby(["day_name", "hour"])["occupancy_level"]
-            .mean()
-            .reset_index()
-        )
-
-        # Pivot: Rows=Day of Week, Cols=Hour
-        heatmap_pivot = heatmap_data.pivot(
-            index="day_name", columns="hour", values="occupancy_level"
-        )
-
-        # Reindex rows to sorted days
-        heatmap_pivot = heatmap_pivot.reindex(days_order)
-    else:
-        heatmap_pivot = pd.DataFrame()
 
-
-def visualize_data(df: pd.DataFrame, output_file: str) -> None:
+def visualize_data(
+    df: pd.DataFrame,
+    counts: pd.Series,
+    pivot_df: pd.DataFrame,
+    output_file: str,
+) -> None:
     """
     Generate and save visualization plots.
 
     Args:
         df: Processed DataFrame.
+        counts: Counts per day, as returned by summarize.
+        pivot_df: Day vs hour pivot, as returned by summarize.
         output_file: Path to save the plot image.
     """
     if df.empty:
@@ -189,8 +526,19 @@ def visualize_data(df: pd.DataFrame, output_file: str) -> None:
     # Colors: 0: Gray, 1: Green, 2: Orange, 3: Red
     colors = {0: "gray", 1: "green", 2: "orange", 3: "red"}
 
+    # Overlapping markers add nothing visually, so draw one point (the peak
+    # level) per bin instead of one per row
+    plot_df = (
+        df.set_index("timestamp")["occupancy_level"]
+        .resample(SCATTER_BIN)
+        .max()
+        .dropna()
+        .astype("int8")
+        .reset_index()
+    )
+
     sns.scatterplot(
-        data=df,
+        data=plot_df,
         x="timestamp",
         y="occupancy_level",
         hue="occupancy_level",
@@ -219,51 +567,19 @@ def visualize_data(df: pd.DataFrame, output_file: str) -> None:
     )
 
     # --- 2. Data Availability (Counts) ---
-    days_order = [
-        "Monday",
-        "Tuesday",
-        "Wednesday",
-        "Thursday",
-        "Friday",
-        "Saturday",
-        "Sunday",
-    ]
-    # Ensure column exists
-    if "day_name" not in df.columns:
-        df["day_name"] = df["timestamp"].dt.day_name()
-
-    sns.countplot(
-        data=df,
-        x="day_name",
-        order=days_order,
-        color="lightgray",
-        edgecolor="black",
-        ax=ax_counts,
+    # Counts were already computed by summarize; just draw the bars
+    ax_counts.bar(
+        counts.index, counts.to_numpy(), color="lightgray", edgecolor="black"
     )
+    ax_counts.grid(False, axis="x")  # Match seaborn's categorical styling
     ax_counts.set_title("Data Points", fontsize=14)
     ax_counts.set_xlabel("")
     ax_counts.set_ylabel("Count")
     plt.setp(ax_counts.get_xticklabels(), rotation=90)  # Vertical for space
 
     # --- 3. Heatmap (Day vs Hour) ---
-    # Re-calculate heatmap pivot locally or pass it.
-    # Better to recalculate clearly here for "Open" times.
-    open_only_df = df[df["occupancy_level"] > 0].copy()
-
-    if not open_only_df.empty:
-        open_only_df["hour"] = open_only_df["timestamp"].dt.hour
-        open_only_df["day_name"] = open_only_df["timestamp"].dt.day_name()
-
-        heatmap_data = (
-            open_only_df.groupby(["day_name", "hour"])["occupancy_level"]
-            .mean()
-            .reset_index()
-        )
-
-        pivot_df = heatmap_data.pivot(
-            index="day_name", columns="hour", values="occupancy_level"
-        )
-        pivot_df = pivot_df.reindex(days_order)
+    # Shows average levels during "Open" times only
+    if not pivot_df.isna().all(axis=None):
 
         # Plot Heatmap
         sns.heatmap(
@@ -311,16 +627,32 @@ def main():
         default=DEFAULT_CSV_PATH,
         help=f"Path to CSV file (default: {DEFAULT_CSV_PATH})",
     )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the CSV in chunks of this many rows, keeping only "
+        "aggregates and a sample in memory (default: load the whole file)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or update the Parquet cache next to the CSV file",
+    )
     args = parser.parse_args()
 
     logging.info(f"Loading data from {args.file}...")
-    df = load_data(args.file)
+    if args.chunksize:
+        df, counts, pivot_df = stream_data(args.file, args.chunksize)
+    else:
+        df = load_data(args.file, use_cache=not args.no_cache)
+        counts, pivot_df = summarize(df)
 
     logging.info("Analyzing data...")
-    analyze_data(df)
+    analyze_data(df, counts)
 
     logging.info(f"Generating visualizations to {OUTPUT_FILENAME}...")
-    visualize_data(df, OUTPUT_FILENAME)
+    visualize_data(df, counts, pivot_df, OUTPUT_FILENAME)
 
     logging.info("Done.")
 
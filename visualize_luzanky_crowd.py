@@ -7,13 +7,27 @@ The expected data format is 'timestamp,occupancy', where occupancy is a string l
 """
 
 import argparse
+import csv
+import importlib.util
+import io
 import logging
+import os
 import sys
 
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-import seaborn as sns
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pacsv = pq = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # Configure logging
 logging.basicConfig(
@@ -23,79 +37,600 @@ logging.basicConfig(
 # Constants
 DEFAULT_CSV_PATH = "data/luzanky.csv"
 OUTPUT_FILENAME = "luzanky_plots.png"
+PLOT_DPI = 150
+PNG_SAVE_KWARGS = {"compress_level": 1, "optimize": False}
+ANNOTATE_THRESHOLD = 0.2
+CSV_COLUMNS = ["timestamp", "occupancy"]
+PARQUET_COLUMNS = ["timestamp", "current", "capacity"]
+# Largest head count or capacity kept; larger values are treated as bad rows
+OCCUPANCY_MAX = int(np.iinfo(np.int16).max)
+# Logged when rows are dropped for a malformed occupancy
+FORMAT_WARNING = (
+    "Some occupancy rows do not match 'current/capacity' format. "
+    "Filtering them out."
+)
+# Parquet metadata key holding how many CSV bytes the cache covers
+CACHE_OFFSET_KEY = b"csv_offset"
+NUMBA_ENGINE_KWARGS = {"parallel": True, "nogil": True}
+# Rows per chunk and rows kept for the time-series plot (--stream)
+STREAM_CHUNKSIZE = 500_000
+SAMPLE_SIZE = 50_000
+DAYS_ORDER = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+
+def load_data(file_path: str, use_cache: bool = True) -> pd.DataFrame:
+    """
+    Load and preprocess the CSV or Parquet data.
+
+    The parsed numbers of a CSV are cached in a Parquet file next to it,
+    along with how many bytes of the CSV they cover. Later runs only parse
+    the rows appended since then.
+
+    Args:
+        file_path: Path to the CSV file, or to a Parquet file such as the
+            cache.
+        use_cache: Whether to read and update the Parquet cache.
+
+    Returns:
+        Processed DataFrame with 'timestamp', 'current', 'capacity', and 'occupancy_percent'.
+    """
+    if file_path.endswith(".parquet"):
+        return _add_derived(_read_parquet(file_path))
+
+    # Caching needs pyarrow
+    use_cache = use_cache and pq is not None
+    cache_path = os.path.splitext(file_path)[0] + ".parquet"
+    cached, offset = _read_cache(cache_path) if use_cache else (None, 0)
+
+    try:
+        with open(file_path, "rb") as f:
+            if offset > os.fstat(f.fileno()).st_size:
+                # The CSV was truncated or replaced, start over
+                cached, offset = None, 0
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        logging.error(f"File not found: {file_path}")
+        sys.exit(1)
+
+    names = CSV_COLUMNS
+    start = 0
+    if cached is None:
+        # The first line is the header, even without a trailing newline
+        start = data.find(b"\n") + 1 or len(data)
+        names = _csv_columns(data[:start])
+
+    # Only cache complete lines, the crawler may be appending right now
+    complete_end = data.rfind(b"\n") + 1
+    complete = data[start:complete_end]
+    partial_start = max(start, complete_end)
+    partial = data[partial_start:]
+
+    frames = [] if cached is None else [cached]
+    if complete.strip() or cached is None:
+        frames.append(_add_counts(_read_csv(complete, names)))
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    if use_cache and complete:
+        _write_cache(cache_path, df, offset + complete_end)
 
+    if partial.strip():
+        partial_df = _read_partial_line(partial, names)
+        if partial_df is not None:
+            df = pd.concat([df, partial_df], ignore_index=True)
 
-def load_data(file_path: str) -> pd.DataFrame:
+    return _add_derived(df)
+
+
+def _add_derived(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Load and preprocess the CSV data.
+    Add the occupancy percentage and the integer calendar keys.
 
     Args:
-        file_path: Path to the CSV file.
+        df: DataFrame with 'timestamp', 'current' and 'capacity'.
 
     Returns:
-        Processed DataFrame with 'timestamp', 'current', 'capacity', and 'occupancy_percent'.
+        The same DataFrame with 'occupancy_percent', 'hour' and 'dow' added,
+        without the rows that have no timestamp.
+    """
+    # Rows without a timestamp (Arrow reads an empty cell as null) have no
+    # calendar keys; NaT would turn into a bogus key in the arithmetic below
+    df.dropna(subset=["timestamp"], inplace=True)
+
+    # Calculate percentage in one pass; zero capacity yields 0% instead of inf
+    current = df["current"].to_numpy()
+    capacity = df["capacity"].to_numpy()
+    percent = np.zeros(current.shape, dtype=np.float32)
+    np.divide(
+        current, capacity, out=percent, where=capacity != 0, dtype=np.float32
+    )
+    percent *= 100.0
+    df["occupancy_percent"] = percent
+
+    # Derive the calendar keys once as small integers with plain integer
+    # arithmetic on epoch seconds. 1970-01-01 was a Thursday, hence +3 for
+    # Monday=0 (same convention as dt.dayofweek).
+    seconds = df["timestamp"].to_numpy().astype("datetime64[s]").view("int64")
+    df["hour"] = (seconds // 3600 % 24).astype("int8")
+    df["dow"] = ((seconds // 86400 + 3) % 7).astype("int8")
+
+    return df
+
+
+def _read_parquet(file_path: str) -> pd.DataFrame:
+    """
+    Read already-parsed data from Parquet; no string parsing needed.
+
+    Args:
+        file_path: Path to the Parquet file.
+
+    Returns:
+        DataFrame with 'timestamp', 'current' and 'capacity'.
     """
     try:
-        df = pd.read_csv(file_path)
+        return pd.read_parquet(
+            file_path, engine="pyarrow", columns=PARQUET_COLUMNS
+        )
     except FileNotFoundError:
         logging.error(f"File not found: {file_path}")
         sys.exit(1)
     except Exception as e:
-        logging.error(f"Error reading CSV: {e}")
+        logging.error(f"Error reading Parquet: {e}")
         sys.exit(1)
 
-    # Clean column names
-    df.columns = df.columns.str.strip().str.lower()
 
-    if "timestamp" not in df.columns or "occupancy" not in df.columns:
-        logging.error("CSV must contain 'timestamp' and 'occupancy' columns.")
-        sys.exit(1)
+def _read_csv(data: bytes, names: list[str]) -> pd.DataFrame:
+    """
+    Parse raw CSV lines (without the header) of the crawler CSV.
+
+    Args:
+        data: CSV content after the header line.
+        names: Normalized column names, as returned by _csv_columns().
+
+    Returns:
+        DataFrame with parsed 'timestamp' and raw 'occupancy' strings.
+    """
+    if not data.strip():
+        # Only the header so far
+        return pd.DataFrame(
+            {
+                "timestamp": pd.Series(dtype="datetime64[ns]"),
+                "occupancy": pd.Series(dtype="str"),
+            }
+        )
 
-    # Parse timestamp
     try:
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        if pacsv is not None:
+            # Multi-threaded C++ reader that also parses the timestamps. It
+            # matches column names exactly, so pass the normalized ones.
+            read_options = pacsv.ReadOptions(column_names=names)
+            convert_options = pacsv.ConvertOptions(
+                column_types={
+                    "timestamp": pa.timestamp("ns"),
+                    "occupancy": pa.string(),
+                },
+                include_columns=CSV_COLUMNS,
+            )
+            table = pacsv.read_csv(
+                io.BytesIO(data),
+                read_options=read_options,
+                convert_options=convert_options,
+            )
+            df = table.to_pandas()
+        else:
+            df = pd.read_csv(
+                io.BytesIO(data), header=None, names=names, usecols=CSV_COLUMNS
+            )
     except Exception as e:
-        logging.error(f"Error parsing timestamps: {e}")
+        logging.error(f"Error reading CSV: {e}")
         sys.exit(1)
 
-    # Parse occupancy "current/capacity"
+    if pacsv is None:
+        # Parse timestamp
+        try:
+            df["timestamp"] = pd.to_datetime(df["timestamp"])
+        except Exception as e:
+            logging.error(f"Error parsing timestamps: {e}")
+            sys.exit(1)
+
+    return df
+
+
+def _read_partial_line(line: bytes, names: list[str]) -> pd.DataFrame | None:
+    """
+    Parse an unterminated last data line, which may be cut off mid-write.
+
+    Args:
+        line: The bytes after the last newline.
+        names: Normalized column names, as returned by _csv_columns().
+
+    Returns:
+        DataFrame like _add_counts() returns with the row, or None if the
+        line is incomplete.
+    """
     try:
-        # Split 'occupancy' into 'current' and 'capacity'
-        # Assumes format "123/456"
-        split_data = df["occupancy"].str.split("/", expand=True)
-
-        # Check if split resulted in 2 columns
-        if split_data.shape[1] != 2:
-            logging.warning(
-                "Some occupancy rows do not match 'current/capacity' format. Filtering them out."
-            )
-            # We can valid rows by checking which are not None
-            valid_rows = split_data[1].notna()
-            split_data = split_data[valid_rows]
-            df = df[valid_rows]
+        df = pd.read_csv(
+            io.BytesIO(line),
+            header=None,
+            names=names,
+            usecols=CSV_COLUMNS,
+            dtype={"occupancy": "str"},
+        )
+        df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601")
+        complete = _split_occupancy(df["occupancy"]).notna().all(axis=None)
+    except Exception:
+        complete = False
+    if not complete:
+        logging.info("Skipping the incomplete last line of the CSV.")
+        return None
+    return _add_counts(df)
+
+
+def _read_cache(cache_path: str) -> tuple[pd.DataFrame | None, int]:
+    """
+    Read the Parquet cache written by _write_cache().
+
+    Args:
+        cache_path: Path to the Parquet file.
+
+    Returns:
+        The cached 'timestamp', 'current' and 'capacity' columns and the CSV
+        byte offset they cover, or (None, 0) if there is no usable cache.
+    """
+    if not os.path.isfile(cache_path):
+        return None, 0
+
+    try:
+        table = pq.read_table(cache_path, columns=PARQUET_COLUMNS)
+        offset = int(table.schema.metadata[CACHE_OFFSET_KEY])
+        return table.to_pandas(), offset
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable cache {cache_path}: {e}")
+        return None, 0
+
+
+def _write_cache(cache_path: str, df: pd.DataFrame, offset: int) -> None:
+    """
+    Store the parsed numbers as Parquet next to the CSV.
+
+    Args:
+        cache_path: Path to the Parquet file.
+        df: DataFrame with 'timestamp', 'current' and 'capacity'.
+        offset: Number of CSV bytes the DataFrame covers.
+    """
+    table = pa.Table.from_pandas(df[PARQUET_COLUMNS], preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), CACHE_OFFSET_KEY: str(offset)}
+    try:
+        pq.write_table(
+            table.replace_schema_metadata(metadata),
+            cache_path,
+            compression="zstd",
+        )
+    except Exception as e:
+        # The cache is only an optimization
+        logging.warning(f"Could not write cache {cache_path}: {e}")
+
+
+def _csv_columns(header: bytes) -> list[str]:
+    """
+    Normalize the CSV header line to lower-case, stripped column names.
+
+    Args:
+        header: The raw header line.
+
+    Returns:
+        Column names in file order.
+    """
+    names = [
+        name.strip().lower()
+        for row in csv.reader([header.decode("utf-8-sig")])
+        for name in row
+    ]
+    if "timestamp" not in names or "occupancy" not in names:
+        logging.error("CSV must contain 'timestamp' and 'occupancy' columns.")
+        sys.exit(1)
+    return names
 
-        df["current"] = pd.to_numeric(split_data[0])
-        df["capacity"] = pd.to_numeric(split_data[1])
 
-        # Calculate percentage
-        # Handle division by zero if capacity is 0 (unlikely but safe)
-        df["occupancy_percent"] = (df["current"] / df["capacity"]) * 100
+def _add_counts(df: pd.DataFrame, warn: bool = True) -> pd.DataFrame:
+    """
+    Parse occupancy "current/capacity" into int16 columns.
 
+    Rows that do not match the format are dropped.
+
+    Args:
+        df: DataFrame with raw 'occupancy' strings.
+        warn: Whether to log when rows are dropped. Chunked callers pass
+            False and warn once themselves.
+
+    Returns:
+        The same DataFrame with 'current' and 'capacity' in place of
+        'occupancy'.
+    """
+    try:
+        nums = _split_occupancy(df["occupancy"])
+
+        # Head counts and capacities comfortably fit in int16
+        if nums[0].notna().all():
+            df["current"] = nums[0].astype("int16")
+            df["capacity"] = nums[1].astype("int16")
+        else:
+            if warn:
+                logging.warning(FORMAT_WARNING)
+            # Nullable columns mark the bad rows, which are then dropped in
+            # place instead of copying the whole frame through a mask
+            df["current"] = nums[0].astype("Int16")
+            df["capacity"] = nums[1].astype("Int16")
+            df.dropna(subset=["current", "capacity"], inplace=True)
+            df["current"] = df["current"].astype("int16")
+            df["capacity"] = df["capacity"].astype("int16")
     except Exception as e:
         logging.error(f"Error parsing occupancy column: {e}")
         sys.exit(1)
 
+    # The raw strings are not needed once parsed
+    df.drop(columns=["occupancy"], inplace=True)
+
     return df
 
 
-def analyze_data(df: pd.DataFrame) -> None:
+def aggregate_day_hour(
+    df: pd.DataFrame, engine: str = "cython"
+) -> pd.DataFrame:
     """
-    Print summary statistics.
+    Aggregate head counts per weekday and hour in a single pass.
+
+    Sums and counts are kept (rather than means) so that coarser averages,
+    e.g. per day, can be derived exactly from this small table.
 
     Args:
         df: Processed DataFrame.
+        engine: "cython" (pandas default) or "numba" for the JIT-compiled sum.
+
+    Returns:
+        DataFrame indexed by (dow, hour) with the 'sum' of 'current', the row
+        'count' and the 'percent_sum' of 'occupancy_percent'.
+    """
+    grouped = df.groupby(["dow", "hour"], observed=True, sort=False)
+    columns = ["current", "occupancy_percent"]
+    if engine == "numba":
+        sums = grouped[columns].sum(
+            engine="numba", engine_kwargs=NUMBA_ENGINE_KWARGS
+        )
+    else:
+        sums = grouped[columns].sum()
+    return pd.DataFrame(
+        {
+            "sum": sums["current"],
+            "count": grouped.size(),
+            "percent_sum": sums["occupancy_percent"],
+        }
+    )
+
+
+def stream_data(
+    file_path: str, chunksize: int, sample_size: int = SAMPLE_SIZE
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Read the CSV in chunks, keeping only running aggregates in memory.
+
+    Args:
+        file_path: Path to the CSV file.
+        chunksize: Number of rows per chunk.
+        sample_size: Number of rows kept for the time-series plot.
+
+    Returns:
+        A uniform random sample of processed rows (always including the
+        first, last and busiest observation) and the same day/hour aggregate
+        as aggregate_day_hour() over all rows.
+    """
+    sums = np.zeros((len(DAYS_ORDER), 24), dtype="int64")
+    counts = np.zeros((len(DAYS_ORDER), 24), dtype="int64")
+    percent_sums = np.zeros((len(DAYS_ORDER), 24), dtype="float64")
+    rng = np.random.default_rng()
+    sample = None
+    first = last = busiest = None
+    filtered = False
+
+    try:
+        with open(file_path, "rb") as f:
+            names = _csv_columns(f.readline())
+
+        # The Arrow reader can't stream, so chunks come from the C parser
+        reader = pd.read_csv(
+            file_path,
+            chunksize=chunksize,
+            header=0,
+            names=names,
+            usecols=CSV_COLUMNS,
+            # Otherwise a chunk of only empty cells is read as float
+            dtype={"occupancy": "str"},
+        )
+        for chunk in reader:
+            chunk["timestamp"] = pd.to_datetime(
+                chunk["timestamp"], format="ISO8601"
+            )
+            rows = len(chunk)
+            chunk = _add_derived(_add_counts(chunk, warn=False))
+            filtered |= len(chunk) < rows
+            if chunk.empty:
+                continue
+
+            keys = (chunk["dow"].to_numpy(), chunk["hour"].to_numpy())
+            np.add.at(sums, keys, chunk["current"].to_numpy())
+            np.add.at(counts, keys, 1)
+            percent = chunk["occupancy_percent"].to_numpy()
+            np.add.at(percent_sums, keys, percent)
+
+            # Reservoir sample: keep the rows with the smallest random keys
+            keyed = chunk.assign(_key=rng.random(len(chunk)))
+            if sample is not None:
+                keyed = pd.concat([sample, keyed])
+            sample = keyed.nsmallest(sample_size, "_key")
+
+            if first is None:
+                first = chunk.iloc[[0]]
+            last = chunk.iloc[[-1]]
+            peak = chunk.loc[[chunk["current"].idxmax()]]
+            peak_count = peak["current"].iat[0]
+            if busiest is None or peak_count > busiest["current"].iat[0]:
+                busiest = peak
+    except FileNotFoundError:
+        logging.error(f"File not found: {file_path}")
+        sys.exit(1)
+    except Exception as e:
+        logging.error(f"Error reading CSV: {e}")
+        sys.exit(1)
+
+    if filtered:
+        logging.warning(FORMAT_WARNING)
+
+    dow, hour = np.nonzero(counts)
+    dh = pd.DataFrame(
+        {
+            "sum": sums[dow, hour],
+            "count": counts[dow, hour],
+            "percent_sum": percent_sums[dow, hour],
+        },
+        index=pd.MultiIndex.from_arrays(
+            [dow.astype("int8"), hour.astype("int8")], names=["dow", "hour"]
+        ),
+    )
+
+    if sample is None:
+        return pd.DataFrame(), dh
+
+    sample = pd.concat([first, busiest, sample.drop(columns="_key"), last])
+    sample = sample[~sample.index.duplicated()].sort_values("timestamp")
+    return sample, dh
+
+
+def _parse_occupancy_kernel(
+    buf: np.ndarray, cur_out: np.ndarray, cap_out: np.ndarray
+) -> None:
+    """
+    Parse fixed-width ASCII rows of "current/capacity" in a single pass.
+
+    Accepts the same ASCII strings as the regex path of _split_occupancy(),
+    including its OCCUPANCY_MAX limit; rows that do not match get -1 in both
+    outputs. The NUL padding can't be told apart from NULs in
+    the data, so the caller must reject those rows itself.
+
+    Args:
+        buf: uint8 array of shape (rows, width), NUL-padded.
+        cur_out: int32 output for the current counts.
+        cap_out: int32 output for the capacities.
+    """
+    for i in range(buf.shape[0]):
+        # 0: leading space, 1: current digits, 2: capacity digits,
+        # 3: trailing space
+        state = 0
+        cur = 0
+        cap = 0
+        cap_digits = 0
+        ok = True
+        for j in range(buf.shape[1]):
+            c = int(buf[i, j])
+            if c == 0:
+                break
+            if 48 <= c <= 57:
+                if state <= 1:
+                    state = 1
+                    cur = cur * 10 + (c - 48)
+                elif state == 2:
+                    cap = cap * 10 + (c - 48)
+                    cap_digits += 1
+                else:
+                    ok = False
+                    break
+                # Stop before long digit runs overflow the int32 accumulators
+                if cur > OCCUPANCY_MAX or cap > OCCUPANCY_MAX:
+                    ok = False
+                    break
+            elif c == 47 and state == 1:
+                state = 2
+            # The ASCII characters Python's \s matches
+            elif c == 32 or 9 <= c <= 13 or 28 <= c <= 31:
+                if state == 2 and cap_digits > 0:
+                    state = 3
+                elif state == 1 or state == 2:
+                    ok = False
+                    break
+            else:
+                ok = False
+                break
+        if ok and state >= 2 and cap_digits > 0:
+            cur_out[i] = cur
+            cap_out[i] = cap
+        else:
+            cur_out[i] = -1
+            cap_out[i] = -1
+
+
+# Compiled when numba is installed, otherwise the regex path below is used
+_parse_occupancy = njit(cache=True)(_parse_occupancy_kernel) if njit else None
+
+
+def _split_occupancy(occupancy: pd.Series) -> pd.DataFrame:
+    """
+    Split "current/capacity" strings into two numeric columns.
+
+    Args:
+        occupancy: Raw occupancy strings.
+
+    Returns:
+        DataFrame with columns 0 (current) and 1 (capacity), <NA> where a row
+        does not match the format or a number is above OCCUPANCY_MAX.
+    """
+    if _parse_occupancy is not None:
+        try:
+            raw = occupancy.fillna("").to_numpy(dtype="S")
+        except UnicodeEncodeError:
+            raw = None
+        if raw is not None:
+            buf = raw.view(np.uint8).reshape(len(raw), raw.itemsize)
+            cur = np.empty(len(raw), dtype=np.int32)
+            cap = np.empty(len(raw), dtype=np.int32)
+            _parse_occupancy(buf, cur, cap)
+            # The bytes dtype strips trailing NULs, which the regex rejects
+            invalid = (cur < 0) | occupancy.str.contains(
+                "\x00", regex=False, na=False
+            ).to_numpy(dtype=bool)
+            return pd.DataFrame(
+                {
+                    0: pd.arrays.IntegerArray(cur, invalid),
+                    1: pd.arrays.IntegerArray(cap, invalid),
+                },
+                index=occupancy.index,
+            )
+
+    # Extract 'current' and 'capacity' from "123/456" in one regex pass
+    nums = occupancy.str.extract(r"^\s*(\d+)/(\d+)\s*$", expand=True)
+    # Digit strings of any length convert to float without overflowing
+    nums = nums.astype("float64")
+    return nums.where(nums.le(OCCUPANCY_MAX).all(axis=1)).astype("Int16")
+
+
+def analyze_data(df: pd.DataFrame, dh: pd.DataFrame) -> None:
+    """
+    Print summary statistics.
+
+    Totals and averages come from the day/hour aggregate, so a sampled
+    DataFrame from stream_data() gives the same numbers as the full one.
+
+    Args:
+        df: Processed DataFrame (or the sample from stream_data()).
+        dh: Day/hour aggregate from aggregate_day_hour() or stream_data().
     """
-    total_rows = len(df)
+    total_rows = int(dh["count"].sum())
     if total_rows == 0:
         print("No data available for analysis.")
         return
@@ -105,8 +640,8 @@ def analyze_data(df: pd.DataFrame) -> None:
     duration = end_date - start_date
 
     max_current = df["current"].max()
-    avg_current = df["current"].mean()
-    mean_percent = df["occupancy_percent"].mean()
+    avg_current = dh["sum"].sum() / total_rows
+    mean_percent = dh["percent_sum"].sum() / total_rows
 
     print("-" * 30)
     print("DATA SUMMARY")
@@ -118,9 +653,13 @@ def analyze_data(df: pd.DataFrame) -> None:
     print(f"Average Occupancy: {avg_current:.1f} people ({mean_percent:.1f}%)")
     print("-" * 30)
 
-    # Busiest days
-    df["day_name"] = df["timestamp"].dt.day_name()
-    avg_by_day = df.groupby("day_name")["current"].mean().sort_values(ascending=False)
+    # Busiest days, grouped on the integer weekday; names only for display
+    by_day = dh.groupby(level="dow", observed=True, sort=False).sum()
+    avg_by_day = (by_day["sum"] / by_day["count"]).rename("current")
+    avg_by_day = avg_by_day.sort_values(ascending=False)
+    avg_by_day.index = pd.Index(
+        [DAYS_ORDER[i] for i in avg_by_day.index], name="day_name"
+    )
 
     print("\nAVERAGE OCCUPANCY BY DAY")
     print("-" * 30)
@@ -128,18 +667,35 @@ def analyze_data(df: pd.DataFrame) -> None:
     print("-" * 30)
 
 
-def visualize_data(df: pd.DataFrame, output_file: str) -> None:
+def visualize_data(
+    df: pd.DataFrame,
+    dh: pd.DataFrame,
+    output_file: str,
+    annotate: bool = False,
+) -> None:
     """
     Generate and save visualization plots.
 
     Args:
         df: Processed DataFrame.
+        dh: Day/hour aggregate from aggregate_day_hour().
         output_file: Path to save the plot image.
+        annotate: Label the busier heatmap cells with their values.
     """
     if df.empty:
         logging.warning("No data to visualize.")
         return
 
+    # Imported here so --no-plot runs skip the slow plotting imports
+    import matplotlib
+
+    # Batch script: render off-screen without probing for a GUI backend
+    matplotlib.use("Agg")
+
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     sns.set_theme(style="whitegrid")
 
     # Layout:
@@ -153,9 +709,33 @@ def visualize_data(df: pd.DataFrame, output_file: str) -> None:
     ax_heatmap = fig.add_subplot(gs[1])
 
     # --- 1. Time Series Plot ---
-    sns.lineplot(
-        data=df, x="timestamp", y="current", ax=ax_ts, linewidth=1.5, color="royalblue"
-    )
+    # One bucket per horizontal pixel of the saved figure; with many more
+    # points than that, draw the per-bucket min/max envelope instead
+    n_buckets = int(fig.get_size_inches()[0] * PLOT_DPI)
+    if len(df) > 4 * n_buckets:
+        start, end = df["timestamp"].min(), df["timestamp"].max()
+        bucket_seconds = max(int((end - start).total_seconds() / n_buckets), 1)
+        envelope = (
+            df.set_index("timestamp")["current"]
+            .resample(f"{bucket_seconds}s")
+            .agg(["min", "max"])
+        )
+        ax_ts.fill_between(
+            envelope.index.to_numpy(),
+            envelope["min"].to_numpy(dtype=float),
+            envelope["max"].to_numpy(dtype=float),
+            linewidth=0,
+            color="royalblue",
+        )
+    else:
+        # Plain arrays straight to matplotlib; seaborn's estimator pass is not
+        # needed for a single series
+        ax_ts.plot(
+            df["timestamp"].to_numpy(),
+            df["current"].to_numpy(),
+            linewidth=1.5,
+            color="royalblue",
+        )
 
     ax_ts.set_title("Pool Utilization Over Time", fontsize=14)
     ax_ts.set_ylabel("Number of People")
@@ -167,7 +747,11 @@ def visualize_data(df: pd.DataFrame, output_file: str) -> None:
     plt.setp(ax_ts.get_xticklabels(), rotation=45, ha="right")
 
     # Add capacity line if constant or use max capacity found
-    max_cap = df["capacity"].max()
+    # Capacity is normally constant; only fall back to a full max() if not
+    capacity = df["capacity"].to_numpy()
+    max_cap = capacity[0]
+    if not (capacity == max_cap).all():
+        max_cap = capacity.max()
     ax_ts.axhline(
         y=max_cap,
         color="red",
@@ -179,33 +763,37 @@ def visualize_data(df: pd.DataFrame, output_file: str) -> None:
     ax_ts.grid(True, which="both", linestyle="--", linewidth=0.5)
 
     # --- 2. Heatmap (Day vs Hour) ---
-    days_order = [
-        "Monday",
-        "Tuesday",
-        "Wednesday",
-        "Thursday",
-        "Friday",
-        "Saturday",
-        "Sunday",
-    ]
+    heatmap_data = dh["sum"] / dh["count"]
 
-    df["hour"] = df["timestamp"].dt.hour
-    df["day_name"] = df["timestamp"].dt.day_name()
-
-    heatmap_data = df.groupby(["day_name", "hour"])["current"].mean().reset_index()
-
-    pivot_df = heatmap_data.pivot(index="day_name", columns="hour", values="current")
-    pivot_df = pivot_df.reindex(days_order)
+    pivot_df = heatmap_data.unstack("hour").sort_index(axis=1)
+    # Rows in weekday order, labelled with day names
+    pivot_df = pivot_df.reindex(range(len(DAYS_ORDER)))
+    pivot_df.index = pd.Index(DAYS_ORDER, name="day_name")
 
     # Determine sensible max for heatmap color scale (e.g., max observed average or capacity)
     # Using 95th percentile of actual data for better contrast, or just max value
-    vmax_val = heatmap_data["current"].max()
+    vmax_val = heatmap_data.max()
+
+    # Whole people per cell as int16; unobserved cells are masked out
+    missing = pivot_df.isna()
+    pivot_df = pivot_df.round().fillna(0).astype("int16")
+
+    # Only label cells at or above 20% of the scale, the rest stay blank
+    annot = False
+    if annotate:
+        values = pivot_df.to_numpy()
+        annot = np.where(
+            (values >= ANNOTATE_THRESHOLD * vmax_val) & ~missing.to_numpy(),
+            values.astype(str),
+            "",
+        )
 
     sns.heatmap(
         pivot_df,
+        mask=missing,
         cmap="YlOrRd",  # Yellow to Red
-        annot=True,  # Show values
-        fmt=".0f",  # Integers
+        annot=annot,
+        fmt="",
         linewidths=0.5,
         vmin=0,
         vmax=vmax_val,
@@ -219,7 +807,11 @@ def visualize_data(df: pd.DataFrame, output_file: str) -> None:
 
     # Save
     try:
-        plt.savefig(output_file, dpi=150)
+        if output_file.endswith(".svg"):
+            plt.savefig(output_file, dpi=PLOT_DPI)
+        else:
+            # Fast, lightly compressed PNG encoding
+            plt.savefig(output_file, dpi=PLOT_DPI, pil_kwargs=PNG_SAVE_KWARGS)
         logging.info(f"Plots saved to {output_file}")
     except Exception as e:
         logging.error(f"Error saving plot: {e}")
@@ -233,16 +825,65 @@ def main():
         default=DEFAULT_CSV_PATH,
         help=f"Path to CSV file (default: {DEFAULT_CSV_PATH})",
     )
+    parser.add_argument(
+        "--engine",
+        choices=["cython", "numba"],
+        default="cython",
+        help="Groupby engine for the day/hour aggregation "
+        "(numba must be installed)",
+    )
+    parser.add_argument(
+        "--annotate",
+        action="store_true",
+        help="Print the average count in the busier heatmap cells",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or update the Parquet cache next to the CSV file",
+    )
+    parser.add_argument(
+        "--no-plot",
+        action="store_true",
+        help="Only print the summary statistics, do not generate plots",
+    )
+    parser.add_argument(
+        "--svg",
+        action="store_true",
+        help="Save the plots as SVG instead of PNG",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read the CSV in chunks and keep only aggregates and a sample "
+        "in memory",
+    )
     args = parser.parse_args()
 
-    logging.info(f"Loading data from {args.file}...")
-    df = load_data(args.file)
+    engine = args.engine
+    if engine == "numba" and importlib.util.find_spec("numba") is None:
+        logging.warning(
+            "numba is not installed, falling back to the default engine."
+        )
+        engine = "cython"
+
+    if args.stream:
+        logging.info(f"Streaming data from {args.file}...")
+        df, dh = stream_data(args.file, STREAM_CHUNKSIZE)
+    else:
+        logging.info(f"Loading data from {args.file}...")
+        df = load_data(args.file, use_cache=not args.no_cache)
+        dh = aggregate_day_hour(df, engine)
 
     logging.info("Analyzing data...")
-    analyze_data(df)
-
-    logging.info(f"Generating visualizations to {OUTPUT_FILENAME}...")
-    visualize_data(df, OUTPUT_FILENAME)
+    analyze_data(df, dh)
+
+    if not args.no_plot:
+        output_file = OUTPUT_FILENAME
+        if args.svg:
+            output_file = os.path.splitext(OUTPUT_FILENAME)[0] + ".svg"
+        logging.info(f"Generating visualizations to {output_file}...")
+        visualize_data(df, dh, output_file, annotate=args.annotate)
 
     logging.info("Done.")
 